@@ -1,13 +1,16 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import joblib
-import ast
-import matplotlib.pyplot as plt
-import seaborn as sns
+import scipy.sparse as sp
+import os
 from PIL import Image
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+
+# Serialisasi figure Plotly ke JSON memakai orjson
+pio.json.config.default_engine = 'orjson'
 
 # Page config
 st.set_page_config(
@@ -18,62 +21,12 @@ st.set_page_config(
 )
 
 # Custom CSS untuk styling modern
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-    
-    .prediction-box {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        margin: 1rem 0;
-    }
-    
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    .stTextArea > div > div > textarea {
-        border-radius: 10px;
-        border: 2px solid #667eea;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 25px;
-        padding: 0.5rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def _css():
+    with open('assets/style.css', encoding='utf-8') as f:
+        return f.read()
+
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
 
 # Load model dan vectorizer
 @st.cache_resource
@@ -86,24 +39,136 @@ def load_models():
         st.error("❌ Model atau vectorizer tidak ditemukan. Pastikan file ada di folder 'model/'")
         return None, None
 
+# Vektor TF-IDF untuk input yang sama tidak perlu dihitung ulang
+@st.cache_data(max_entries=128)
+def _vectorize(text):
+    _, vectorizer = load_models()
+    return vectorizer.transform([text])
+
+DATA_CSV = 'data/hasil_preprocessing_mobile_jkn.csv'
+DATA_PARQUET = 'data/hasil_preprocessing_mobile_jkn.parquet'
+
+# Hanya kolom ini yang dipakai aplikasi; EXTRA_COLS ikut dimuat jika ada di CSV
+DATA_COLS = ['label', 'stemming']
+EXTRA_COLS = ['content']
+
+def _data_columns():
+    header = pd.read_csv(DATA_CSV, nrows=0).columns
+    return DATA_COLS + [c for c in EXTRA_COLS if c in header]
+
+# Hapus kurung dan tanda kutip, ubah koma jadi spasi dalam satu kali translate
+_STEMMING_TABLE = str.maketrans({'[': None, ']': None, "'": None, '"': None, ',': ' '})
+
+# Baca dataset dari cache Parquet; jika belum ada atau CSV lebih baru, bangun ulang dari CSV
+def _read_dataset():
+    columns = _data_columns()
+    if os.path.exists(DATA_PARQUET) and os.path.getmtime(DATA_PARQUET) >= os.path.getmtime(DATA_CSV):
+        return pd.read_parquet(DATA_PARQUET, columns=columns)
+    df = pd.read_csv(DATA_CSV, usecols=columns)
+    # Kolom stemming berisi list dalam bentuk string, mis. "['kata', 'lain']"
+    df['stemming'] = df['stemming'].str.translate(_STEMMING_TABLE).str.split().str.join(' ')
+    # Tulis ke file sementara lalu os.replace, agar proses lain tidak membaca file setengah jadi
+    tmp_path = f"{DATA_PARQUET}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, DATA_PARQUET)
+    except OSError:
+        # Folder data/ tidak bisa ditulis: cukup pakai hasil di memori
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
 # Load data
 @st.cache_data
 def load_data():
     try:
-        df = pd.read_csv('data/hasil_preprocessing_mobile_jkn.csv')
-        df['stemming'] = df['stemming'].apply(lambda x: ' '.join(ast.literal_eval(x)) if isinstance(x, str) else x)
+        df = _read_dataset()
+        # Perkecil tipe data: label jadi kategori
+        df['label'] = df['label'].astype('category')
+        df['stemming'] = df['stemming'].astype('string[pyarrow]')
         return df
     except FileNotFoundError:
         st.error("❌ Dataset tidak ditemukan. Pastikan file ada di folder 'data/'")
         return None
 
+# Di bawah jumlah baris ini, overhead proses paralel lebih besar dari manfaatnya
+PARALLEL_MIN_ROWS = 50_000
+
+# Matriks TF-IDF seluruh dataset (CSR), dihitung sekali untuk analisis batch,
+# mis. X = _corpus_tfidf(); scores = model.decision_function(X)
+@st.cache_resource
+def _corpus_tfidf():
+    _, vectorizer = load_models()
+    df = load_data()
+    if vectorizer is None or df is None:
+        return None
+    texts = df['stemming'].fillna('').to_numpy()
+    n_jobs = joblib.cpu_count()
+    if len(texts) < PARALLEL_MIN_ROWS or n_jobs < 2:
+        return vectorizer.transform(texts)
+    # Korpus besar dibagi per core, ditransformasi paralel, lalu digabung kembali
+    chunks = np.array_split(texts, n_jobs)
+    mats = joblib.Parallel(n_jobs=n_jobs, backend='loky')(
+        joblib.delayed(vectorizer.transform)(chunk) for chunk in chunks
+    )
+    return sp.vstack(mats, format='csr')
+
+# Hitung distribusi label sekali, dipakai ulang di Dashboard dan Visualisasi.
+# Tanpa argumen agar Streamlit tidak meng-hash seluruh DataFrame di setiap rerun
+@st.cache_data
+def sentiment_counts():
+    return load_data()['label'].value_counts()
+
+# Jumlah dan persentase per label, diturunkan dari hitungan yang sudah di-cache
+@st.cache_data
+def sentiment_stats():
+    stats = sentiment_counts().to_frame('count')
+    stats['pct'] = stats['count'] / stats['count'].sum() * 100
+    return stats
+
+SENTIMENT_COLORS = ['#ff6b6b', '#4ecdc4', '#45b7d1']
+
+# Figure Plotly dibangun sekali per data dengan graph_objects (lebih cepat dari plotly.express)
+@st.cache_resource
+def _pie_fig(labels, values, title, colors=None, hole=0, **layout):
+    fig = go.Figure(data=[go.Pie(
+        labels=list(labels),
+        values=list(values),
+        hole=hole,
+        marker_colors=list(colors) if colors else None
+    )])
+    fig.update_layout(title=title, **layout)
+    return fig
+
+@st.cache_resource
+def _bar_fig(labels, values, title):
+    fig = go.Figure(data=[go.Bar(
+        x=list(labels),
+        y=list(values),
+        marker=dict(color=list(values), colorscale=SENTIMENT_COLORS, showscale=True)
+    )])
+    fig.update_layout(title=title, xaxis_title='Label Sentimen', yaxis_title='Jumlah')
+    return fig
+
+# Serialisasi CSV untuk tombol download cukup sekali
+@st.cache_data
+def _csv_bytes():
+    return load_data().to_csv(index=False).encode('utf-8')
+
+# Decode gambar word cloud sekali saja, bukan di setiap rerun
+@st.cache_resource
+def _wordcloud_images():
+    return {
+        'pos': Image.open('images/positif.png').copy(),
+        'neg': Image.open('images/negatif.png').copy(),
+        'all': Image.open('images/seluruh kata.png').copy(),
+    }
+
 # Header utama
 st.markdown('<h1 class="main-header">📱 Mobile JKN Sentiment Analysis</h1>', unsafe_allow_html=True)
 
-# Load data dan model
-model, vectorizer = load_models()
-df = load_data()
-
 # Sidebar dengan styling modern
 st.sidebar.markdown("""
 <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; margin-bottom: 1rem;">
@@ -120,16 +185,18 @@ option = st.sidebar.radio(
 
 # Dashboard Overview
 if option == "🏠 Dashboard":
+        # Data dimuat per halaman, hanya di halaman yang membutuhkannya
+        df = load_data()
+        
         # Quick visualization
         st.markdown("### 📊 Distribusi Sentimen Cepat")
-        if 'label' in df.columns:
-            fig = px.pie(
-                values=df['label'].value_counts().values, 
-                names=df['label'].value_counts().index,
-                title="Distribusi Sentimen Mobile JKN",
-                color_discrete_sequence=['#ff6b6b', '#4ecdc4', '#45b7d1']
-            )
-            fig.update_layout(
+        if df is not None and 'label' in df.columns:
+            sentiment_count = sentiment_counts()
+            fig = _pie_fig(
+                tuple(sentiment_count.index),
+                tuple(sentiment_count.values.tolist()),
+                "Distribusi Sentimen Mobile JKN",
+                colors=SENTIMENT_COLORS,
                 title_font_size=20,
                 font=dict(size=14),
                 showlegend=True
@@ -139,6 +206,7 @@ if option == "🏠 Dashboard":
 # Tampilan dataset
 elif option == "📄 Dataset":
     st.markdown("## 📄 Dataset Mobile JKN")
+    df = load_data()
     
     if df is not None:
         # Info dataset
@@ -150,21 +218,24 @@ elif option == "📄 Dataset":
         
         with col2:
             st.markdown("### 🔍 Filter Data")
-            show_rows = st.selectbox("Tampilkan baris:", [10, 20, 50, 100, len(df)])
+            page_size = 50
+            total_pages = max(1, -(-len(df) // page_size))
+            page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, step=1)
         
-        # Display dataset dengan styling
+        # Display dataset dengan styling, hanya satu halaman yang dikirim ke browser
         st.markdown("### 📊 Data Preview")
+        st.info(f"ℹ️ Menampilkan halaman {page} dari {total_pages} ({page_size} baris per halaman). Gunakan tombol download untuk dataset lengkap.")
+        start = (page - 1) * page_size
         st.dataframe(
-            df.head(show_rows), 
+            df.iloc[start:start + page_size], 
             use_container_width=True,
             height=400
         )
         
         # Download button
-        csv = df.to_csv(index=False)
         st.download_button(
             label="📥 Download Dataset",
-            data=csv,
+            data=_csv_bytes(),
             file_name='mobile_jkn_dataset.csv',
             mime='text/csv'
         )
@@ -172,6 +243,7 @@ elif option == "📄 Dataset":
 # Prediksi manual
 elif option == "🧠 Prediksi Manual":
     st.markdown("## 🧠 Prediksi Sentimen Manual")
+    model, vectorizer = load_models()
     
     if model is not None and vectorizer is not None:
         # Form prediksi dengan styling modern
@@ -194,9 +266,16 @@ elif option == "🧠 Prediksi Manual":
             if user_input.strip():
                 try:
                     # Prediksi
-                    input_vector = vectorizer.transform([user_input])
-                    hasil_prediksi = model.predict(input_vector)[0]
-                    confidence = model.decision_function(input_vector)[0]
+                    input_vector = _vectorize(user_input)
+                    # Label diturunkan dari decision_function agar kernel SVM cukup dihitung sekali
+                    scores = model.decision_function(input_vector)[0]
+                    if np.ndim(scores) == 0:
+                        hasil_prediksi = model.classes_[int(scores > 0)]
+                        confidence = scores
+                    else:
+                        idx = int(np.argmax(scores))
+                        hasil_prediksi = model.classes_[idx]
+                        confidence = scores[idx] - np.partition(scores, -2)[-2]
                     
                     # Styling hasil prediksi
                     if hasil_prediksi.lower() == 'positif':
@@ -230,6 +309,7 @@ elif option == "🧠 Prediksi Manual":
 # Visualisasi hasil
 elif option == "📈 Visualisasi Sentimen":
     st.markdown("## 📈 Visualisasi Hasil Sentimen")
+    df = load_data()
     
     if df is not None and 'label' in df.columns:
         # Tabs untuk berbagai visualisasi
@@ -240,24 +320,19 @@ elif option == "📈 Visualisasi Sentimen":
             
             with col1:
                 # Bar chart dengan Plotly
-                sentiment_count = df['label'].value_counts()
-                fig_bar = px.bar(
-                    x=sentiment_count.index, 
-                    y=sentiment_count.values,
-                    title="📊 Distribusi Sentimen (Bar Chart)",
-                    labels={'x': 'Label Sentimen', 'y': 'Jumlah'},
-                    color=sentiment_count.values,
-                    color_continuous_scale=['#ff6b6b', '#4ecdc4', '#45b7d1']
-                )
+                sentiment_count = sentiment_counts()
+                labels = tuple(sentiment_count.index)
+                values = tuple(sentiment_count.values.tolist())
+                fig_bar = _bar_fig(labels, values, "📊 Distribusi Sentimen (Bar Chart)")
                 st.plotly_chart(fig_bar, use_container_width=True)
             
             with col2:
                 # Pie chart dengan Plotly
-                fig_pie = px.pie(
-                    values=sentiment_count.values, 
-                    names=sentiment_count.index,
-                    title="🥧 Distribusi Sentimen (Pie Chart)",
-                    color_discrete_sequence=['#ff6b6b', '#4ecdc4', '#45b7d1']
+                fig_pie = _pie_fig(
+                    labels,
+                    values,
+                    "🥧 Distribusi Sentimen (Pie Chart)",
+                    colors=SENTIMENT_COLORS
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
         
@@ -266,22 +341,20 @@ elif option == "📈 Visualisasi Sentimen":
             
             # Load dan tampilkan gambar wordcloud
             try:
+                imgs = _wordcloud_images()
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
                     st.markdown("#### 😊 Word Cloud Positif")
-                    img_positive = Image.open('images/positif.png')
-                    st.image(img_positive, use_container_width=True)
+                    st.image(imgs['pos'], use_container_width=True)
                 
                 with col2:
                     st.markdown("#### 😞 Word Cloud Negatif")
-                    img_negative = Image.open('images/negatif.png')
-                    st.image(img_negative, use_container_width=True)
+                    st.image(imgs['neg'], use_container_width=True)
                 
                 with col3:
                     st.markdown("#### 😐 Keseluruhan")
-                    img_neutral = Image.open('images/seluruh kata.png')
-                    st.image(img_neutral, use_container_width=True)
+                    st.image(imgs['all'], use_container_width=True)
                     
             except FileNotFoundError:
                 st.error("❌ Gambar word cloud tidak ditemukan. Pastikan file ada di folder 'images/'")
@@ -295,25 +368,21 @@ elif option == "📈 Visualisasi Sentimen":
             with col1:
                 # Statistik detail
                 st.markdown("#### 📊 Statistik Sentimen")
-                total_data = len(df)
-                for sentiment in df['label'].unique():
-                    count = len(df[df['label'] == sentiment])
-                    percentage = (count / total_data) * 100
+                stats = sentiment_stats()
+                for sentiment, row in stats.iterrows():
                     st.metric(
                         label=f"{sentiment.title()}",
-                        value=f"{count}",
-                        delta=f"{percentage:.1f}%"
+                        value=f"{int(row['count'])}",
+                        delta=f"{row['pct']:.1f}%"
                     )
             
             with col2:
                 # Donut chart
-                fig_donut = go.Figure(data=[go.Pie(
-                    labels=sentiment_count.index, 
-                    values=sentiment_count.values, 
-                    hole=.3
-                )])
-                fig_donut.update_layout(
-                    title="🍩 Donut Chart Sentimen",
+                fig_donut = _pie_fig(
+                    labels,
+                    values,
+                    "🍩 Donut Chart Sentimen",
+                    hole=.3,
                     annotations=[dict(text='Sentimen', x=0.5, y=0.5, font_size=20, showarrow=False)]
                 )
                 st.plotly_chart(fig_donut, use_container_width=True)